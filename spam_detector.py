@@ -5,6 +5,162 @@ Rule-Based Spam Detection without Machine Learning
 
 import re
 import string
+import sys
+import weakref
+from collections.abc import Mapping
+
+
+URL_PATTERNS = [
+    r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+',
+    r'www\.[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+    r'[a-zA-Z0-9.-]+\.(com|net|org|info|biz|ru|tk|ml|ga|cf|gq|xyz|click|download|link)'
+]
+_URL_REGEXES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in URL_PATTERNS)
+
+# End of the host part of a URL once the scheme is removed
+HOST_END_PATTERN = re.compile(r'[/?#:]')
+
+# Patterns and tables used on every email, built once
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+_WHITESPACE = re.compile(r'\s+')
+_REPEATED_SPECIAL = re.compile(r'([!?*#$%&])\1{2,}')
+_ALL_CAPS_WORD = re.compile(r'\b[A-Z]{4,}\b')
+_NUMBER = re.compile(r'\d+')
+
+# Entries of the features dict that are not artifacts
+RESERVED_FEATURES = ('ruleset',)
+
+# Compiled keyword matchers shared by every ruleset in the process
+_KEYWORD_PATTERNS = weakref.WeakValueDictionary()
+
+
+def normalize_keywords(keywords):
+    """
+    Check that keywords is a list of strings and return them lowercased
+    and interned, so equal keyword lists share their strings and matchers
+    """
+    if isinstance(keywords, str):
+        raise ValueError("keywords must be a list of strings")
+    # Copy first so one-pass iterables survive the check
+    keywords = list(keywords)
+    if not all(isinstance(k, str) for k in keywords):
+        raise ValueError("keywords must be a list of strings")
+    return tuple(sys.intern(keyword.lower()) for keyword in keywords)
+
+
+def compile_keyword(keyword):
+    """Return the shared word-boundary matcher for a keyword"""
+    pattern = _KEYWORD_PATTERNS.get(keyword)
+    if pattern is None:
+        # Use word boundaries to avoid partial matches
+        pattern = re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE)
+        pattern = _KEYWORD_PATTERNS.setdefault(keyword, pattern)
+    return pattern
+
+
+class Ruleset:
+    """
+    Spam keywords and threshold used for one classification
+    Rulesets are never modified after creation, so one can be swapped
+    for another while classifications using the old one finish.
+    """
+    
+    def __init__(self, keywords, threshold=3):
+        if isinstance(threshold, bool) or not isinstance(threshold, (int, float)):
+            raise ValueError("threshold must be a number")
+        self.keywords = normalize_keywords(keywords)
+        self.threshold = threshold
+        self.patterns = tuple(compile_keyword(keyword) for keyword in self.keywords)
+        # ASCII keywords in ASCII text can only match where they occur as a
+        # substring, so the regex can be skipped when they don't
+        self.ascii = all(keyword.isascii() for keyword in self.keywords)
+    
+    def __repr__(self):
+        return f"Ruleset({len(self.keywords)} keywords, threshold={self.threshold})"
+
+
+# Keys of the detailed analysis, in report order, and the artifact each needs
+ANALYSIS_KEYS = (
+    'spam_score', 'threshold', 'keyword_count', 'found_keywords', 'url_count',
+    'url_hosts', 'keyword_counts', 'excessive_capitals', 'exclamation_marks',
+    'repeated_special_chars', 'repeated_keywords'
+)
+ANALYSIS_ARTIFACTS = {
+    'keyword_count': 'keyword_counts',
+    'found_keywords': 'keyword_counts',
+    'url_count': 'url_count',
+    'url_hosts': 'urls',
+    'keyword_counts': 'keyword_counts',
+    'excessive_capitals': 'excessive_capitals',
+    'exclamation_marks': 'char_stats',
+    'repeated_special_chars': 'repeated_special_chars',
+    'repeated_keywords': 'repeated_keywords'
+}
+
+
+class LazyAnalysis(Mapping):
+    """
+    Read-only analysis dict whose entries are computed when first read
+    Returned by SpamDetector.classify_lazy; dict(analysis) gives the
+    same dict classify() returns.
+    """
+    
+    def __init__(self, detector, text, features, spam_score):
+        self._detector = detector
+        self._text = text
+        self._features = features
+        self._values = {'spam_score': spam_score}
+    
+    def __getitem__(self, key):
+        if key not in self._values:
+            if key not in ANALYSIS_KEYS:
+                raise KeyError(key)
+            self._values[key] = self._detector._analysis_value(key, self._text, self._features)
+        return self._values[key]
+    
+    def __contains__(self, key):
+        # Membership must not compute the value
+        return key in ANALYSIS_KEYS
+    
+    def __iter__(self):
+        return iter(ANALYSIS_KEYS)
+    
+    def __len__(self):
+        return len(ANALYSIS_KEYS)
+    
+    def __repr__(self):
+        return f"LazyAnalysis(computed={list(self._values)!r})"
+
+
+class SpamRule:
+    """A single scoring rule and the intermediate artifacts it consumes"""
+    
+    def __init__(self, name, func, requires=(), enabled=True):
+        """
+        func is called as func(text, features) and returns the points the
+        rule adds to the spam score. features holds the artifacts named
+        in requires (plus their own dependencies) and the active Ruleset
+        under 'ruleset'.
+        """
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self._enabled = enabled
+        # Detector whose cached scoring plan depends on this rule
+        self._owner = None
+    
+    @property
+    def enabled(self):
+        return self._enabled
+    
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = value
+        if self._owner is not None:
+            self._owner._plan = None
+    
+    def __repr__(self):
+        return f"SpamRule({self.name!r}, requires={self.requires!r}, enabled={self.enabled})"
 
 
 class SpamDetector:
@@ -28,6 +184,122 @@ class SpamDetector:
         # Threshold for spam classification
         self.spam_threshold = 3
         
+        # Ruleset built from the two attributes above, rebuilt when they change
+        self._default_ruleset = None
+        self._default_keywords = None
+        
+        # (artifacts, rule functions) of the enabled rules, built when needed
+        self._plan = None
+        
+        # Intermediate artifacts shared between rules: name -> (requires, func)
+        self.artifacts = {}
+        self.register_artifact('normalized', lambda text, f: self.preprocess_text(text))
+        self.register_artifact('tokens', lambda text, f: f['normalized'].split(),
+                               requires=('normalized',))
+        self.register_artifact('keyword_counts', self._extract_keyword_counts,
+                               requires=('normalized',))
+        self.register_artifact('urls', self._extract_urls)
+        self.register_artifact('url_count', self._extract_url_count)
+        self.register_artifact('char_stats', self._extract_char_stats)
+        
+        # Results of the yes/no checks, shared by the rules and the analysis
+        self.register_artifact('excessive_capitals', self._extract_excessive_capitals,
+                               requires=('char_stats',))
+        self.register_artifact('repeated_special_chars', self._extract_repeated_special_chars)
+        self.register_artifact('repeated_keywords', self._extract_repeated_keywords,
+                               requires=('keyword_counts',))
+        
+        # Scoring rules, applied in registration order
+        self.rules = []
+        self.register_rule('keywords', self._rule_keywords, requires=('keyword_counts',))
+        self.register_rule('urls', self._rule_urls, requires=('url_count',))
+        self.register_rule('excessive_capitals', self._rule_excessive_capitals,
+                           requires=('excessive_capitals',))
+        self.register_rule('exclamation_marks', self._rule_exclamation_marks,
+                           requires=('char_stats',))
+        self.register_rule('repeated_special_chars', self._rule_repeated_special_chars,
+                           requires=('repeated_special_chars',))
+        self.register_rule('repeated_keywords', self._rule_repeated_keywords,
+                           requires=('repeated_keywords',))
+        self.register_rule('email_structure', self._rule_email_structure)
+    
+    def register_artifact(self, name, func, requires=()):
+        """
+        Register an intermediate artifact computed as func(text, features).
+        Dependencies must already be registered, which also rules out cycles.
+        """
+        if name in RESERVED_FEATURES:
+            raise ValueError(f"Artifact name '{name}' is reserved")
+        if name in self.artifacts:
+            raise ValueError(f"Artifact '{name}' is already registered")
+        for dep in requires:
+            if dep not in self.artifacts:
+                raise ValueError(f"Unknown artifact '{dep}' required by '{name}'")
+        self.artifacts[name] = (tuple(requires), func)
+    
+    def register_rule(self, name, func, requires=(), enabled=True):
+        """
+        Add a scoring rule. requires lists the artifacts the rule reads from
+        its features dict; each one is computed at most once per email.
+        """
+        for dep in requires:
+            if dep not in self.artifacts:
+                raise ValueError(f"Unknown artifact '{dep}' required by rule '{name}'")
+        if self.get_rule(name) is not None:
+            raise ValueError(f"Rule '{name}' is already registered")
+        rule = SpamRule(name, func, requires, enabled)
+        rule._owner = self
+        self.rules.append(rule)
+        self._plan = None
+        return rule
+    
+    def unregister_rule(self, name):
+        """Remove a rule by name"""
+        rule = self.get_rule(name)
+        if rule is None:
+            raise KeyError(name)
+        self.rules.remove(rule)
+        rule._owner = None
+        self._plan = None
+    
+    def get_rule(self, name):
+        """Return the rule with the given name, or None"""
+        for rule in self.rules:
+            if rule.name == name:
+                return rule
+        return None
+    
+    def default_ruleset(self):
+        """Ruleset matching the current spam_keywords and spam_threshold"""
+        ruleset = self._default_ruleset
+        # Comparing against a copy of the list allocates nothing
+        if (ruleset is None or self.spam_keywords != self._default_keywords
+                or self.spam_threshold != ruleset.threshold):
+            ruleset = Ruleset(self.spam_keywords, self.spam_threshold)
+            self._default_ruleset = ruleset
+            self._default_keywords = list(self.spam_keywords)
+        return ruleset
+    
+    def extract_features(self, text, names, ruleset=None):
+        """
+        Compute the requested artifacts (and their dependencies) for text.
+        Each artifact is computed once; the returned dict holds nothing
+        else apart from the ruleset, which defaults to default_ruleset().
+        """
+        features = {'ruleset': ruleset or self.default_ruleset()}
+        for name in names:
+            self._resolve(text, name, features)
+        return features
+    
+    def _resolve(self, text, name, features):
+        """Add one artifact and its dependencies to features if missing"""
+        if name in features:
+            return
+        requires, func = self.artifacts[name]
+        for dep in requires:
+            self._resolve(text, dep, features)
+        features[name] = func(text, features)
+    
     def preprocess_text(self, text):
         """
         Module 2: Text Preprocessing
@@ -37,196 +309,291 @@ class SpamDetector:
         text = text.lower()
         
         # Remove punctuation
-        text = text.translate(str.maketrans('', '', string.punctuation))
+        text = text.translate(_PUNCTUATION_TABLE)
         
         # Remove extra spaces
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE.sub(' ', text)
         
         # Keep original for some checks (URLs, capitals)
         return text.strip()
     
+    def _extract_keyword_counts(self, text, features):
+        """
+        (keyword, occurrences) for each spam keyword entry found in the
+        normalized text, in keyword list order. Duplicate entries in the
+        keyword list are counted once per entry.
+        """
+        text_lower = features['normalized']
+        ruleset = features['ruleset']
+        prefilter = ruleset.ascii and text_lower.isascii()
+        keyword_counts = []
+        
+        for keyword, pattern in zip(ruleset.keywords, ruleset.patterns):
+            if prefilter and keyword not in text_lower:
+                continue
+            matches = pattern.findall(text_lower)
+            if matches:
+                keyword_counts.append((keyword, len(matches)))
+        
+        return keyword_counts
+    
+    def _extract_urls(self, text, features):
+        """Every URL-like match, one entry per pattern hit"""
+        urls = []
+        for pattern in _URL_REGEXES:
+            for match in pattern.finditer(text):
+                urls.append(match.group(0))
+        return urls
+    
+    def _extract_url_count(self, text, features):
+        """Number of URL-like matches, without keeping the matched strings"""
+        if 'urls' in features:
+            return len(features['urls'])
+        count = 0
+        for pattern in _URL_REGEXES:
+            for _ in pattern.finditer(text):
+                count += 1
+        return count
+    
+    def _extract_char_stats(self, text, features):
+        """Character counts used by the capitals and punctuation rules"""
+        return {
+            'length': len(text),
+            'uppercase': sum(map(str.isupper, text)),
+            'letters': sum(map(str.isalpha, text)),
+            'exclamations': text.count('!')
+        }
+    
+    def _extract_excessive_capitals(self, text, features):
+        """More than 30% of the letters are uppercase"""
+        stats = features['char_stats']
+        if stats['length'] == 0 or stats['letters'] == 0:
+            return False
+        return stats['uppercase'] / stats['letters'] > 0.3
+    
+    def _extract_repeated_special_chars(self, text, features):
+        """Runs like !!!, ???, ***, etc."""
+        return _REPEATED_SPECIAL.search(text) is not None
+    
+    def _extract_repeated_keywords(self, text, features):
+        """Any keyword appears 3+ times"""
+        keyword_counts = features['keyword_counts']
+        return bool(keyword_counts) and max(count for _, count in keyword_counts) >= 3
+    
+    def url_hosts(self, urls):
+        """Distinct lowercase host names from a list of URL matches, in order"""
+        hosts = []
+        for url in urls:
+            host = url.lower().split('://', 1)[-1]
+            host = HOST_END_PATTERN.split(host, maxsplit=1)[0]
+            if host and host not in hosts:
+                hosts.append(host)
+        return hosts
+    
     def count_spam_keywords(self, text):
         """
         Module 3: Keyword Matching
         Count number of spam keywords found in email
         """
-        text_lower = self.preprocess_text(text)
-        count = 0
-        found_keywords = []
-        
-        for keyword in self.spam_keywords:
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            if matches:
-                count += len(matches)
-                found_keywords.append(keyword)
-        
-        return count, found_keywords
+        features = self.extract_features(text, ('keyword_counts',))
+        keyword_counts = features['keyword_counts']
+        return (sum(count for _, count in keyword_counts),
+                [keyword for keyword, _ in keyword_counts])
     
     def check_suspicious_urls(self, text):
         """
         Module 4: Rule 1 - Check for suspicious URLs
         """
-        # Look for http, https, www patterns
-        url_patterns = [
-            r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+',
-            r'www\.[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-            r'[a-zA-Z0-9.-]+\.(com|net|org|info|biz|ru|tk|ml|ga|cf|gq|xyz|click|download|link)'
-        ]
-        
-        url_count = 0
-        for pattern in url_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            url_count += len(matches)
-        
-        return url_count
+        return self.extract_features(text, ('url_count',))['url_count']
     
     def check_excessive_capitals(self, text):
         """
         Module 4: Rule 2 - Check for excessive capital letters
         """
-        if len(text) == 0:
-            return 0
-        
-        # Count uppercase letters
-        uppercase_count = sum(1 for char in text if char.isupper())
-        total_letters = sum(1 for char in text if char.isalpha())
-        
-        if total_letters == 0:
-            return 0
-        
-        # Calculate percentage of uppercase letters
-        uppercase_ratio = uppercase_count / total_letters
-        
-        # If more than 30% are uppercase, it's suspicious
-        if uppercase_ratio > 0.3:
-            return 1
-        return 0
+        return self._rule_excessive_capitals(
+            text, self.extract_features(text, ('excessive_capitals',)))
     
     def check_exclamation_marks(self, text):
         """
         Module 4: Rule 3 - Check for too many exclamation marks
         """
-        exclamation_count = text.count('!')
-        
-        # More than 2 exclamation marks is suspicious
-        if exclamation_count > 2:
-            return 1
-        return 0
+        return self._rule_exclamation_marks(text, self.extract_features(text, ('char_stats',)))
     
     def check_repeated_special_chars(self, text):
         """
         Module 4: Rule 4 - Check for repeated special characters
         """
-        # Look for patterns like !!!, ???, ***, etc.
-        pattern = r'([!?*#$%&])\1{2,}'
-        matches = re.findall(pattern, text)
-        
-        if matches:
-            return 1
-        return 0
+        return self._rule_repeated_special_chars(
+            text, self.extract_features(text, ('repeated_special_chars',)))
     
     def check_repeated_spam_keywords(self, text):
         """
         Module 4: Rule 5 - Check for repeated spam keywords
         """
-        text_lower = self.preprocess_text(text)
-        keyword_counts = {}
-        
-        for keyword in self.spam_keywords:
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            if len(matches) > 1:  # Keyword appears more than once
-                keyword_counts[keyword] = len(matches)
-        
-        # If any keyword appears 3+ times, it's suspicious
-        if keyword_counts and max(keyword_counts.values()) >= 3:
-            return 1
-        return 0
+        return self._rule_repeated_keywords(
+            text, self.extract_features(text, ('repeated_keywords',)))
     
     def check_email_structure(self, text):
         """
         Additional rule: Check for suspicious email structure
         """
+        return self._rule_email_structure(text, {})
+    
+    def _rule_keywords(self, text, features):
+        keyword_count = sum(count for _, count in features['keyword_counts'])
+        return min(keyword_count * 0.5, 3)  # Cap at 3 points
+    
+    def _rule_urls(self, text, features):
+        return min(features['url_count'] * 0.5, 2)  # Cap at 2 points
+    
+    def _rule_excessive_capitals(self, text, features):
+        # If more than 30% are uppercase, it's suspicious
+        return 1 if features['excessive_capitals'] else 0
+    
+    def _rule_exclamation_marks(self, text, features):
+        # More than 2 exclamation marks is suspicious
+        if features['char_stats']['exclamations'] > 2:
+            return 1
+        return 0
+    
+    def _rule_repeated_special_chars(self, text, features):
+        return 1 if features['repeated_special_chars'] else 0
+    
+    def _rule_repeated_keywords(self, text, features):
+        return 1 if features['repeated_keywords'] else 0
+    
+    def _rule_email_structure(self, text, features):
         score = 0
         
         # Check for all caps words (more than 3 characters)
-        all_caps_words = re.findall(r'\b[A-Z]{4,}\b', text)
+        all_caps_words = _ALL_CAPS_WORD.findall(text)
         if len(all_caps_words) > 2:
             score += 1
         
         # Check for excessive numbers (spam often has phone numbers, prices)
-        numbers = re.findall(r'\d+', text)
+        numbers = _NUMBER.findall(text)
         if len(numbers) > 5:
             score += 0.5
         
         return score
     
-    def calculate_spam_score(self, text):
+    def _score_features(self, text, features):
+        """Sum the enabled rules over already extracted features"""
+        score = 0
+        for func in self._scoring_plan()[1]:
+            score += func(text, features)
+        return round(score, 2)
+    
+    def _scoring_plan(self):
+        """
+        Artifacts and functions of the enabled rules, plus the artifacts a
+        full analysis needs. Cached until rules are added, removed, enabled
+        or disabled.
+        """
+        plan = self._plan
+        if plan is None:
+            names = []
+            funcs = []
+            for rule in self.rules:
+                if rule.enabled:
+                    funcs.append(rule.func)
+                    for name in rule.requires:
+                        if name not in names:
+                            names.append(name)
+            # URLs first, so url_count reuses the list instead of rescanning
+            report_names = ['urls'] + names
+            for name in ANALYSIS_ARTIFACTS.values():
+                if name not in report_names:
+                    report_names.append(name)
+            plan = self._plan = (tuple(names), tuple(funcs), tuple(report_names))
+        return plan
+    
+    def _required_artifacts(self):
+        """Artifacts needed by the currently enabled rules"""
+        return self._scoring_plan()[0]
+    
+    def calculate_spam_score(self, text, ruleset=None):
         """
         Module 4: Rule-Based Analysis
-        Calculate total spam score based on all rules
+        Calculate total spam score based on all enabled rules
         """
-        score = 0
-        
-        # Rule 1: Spam keywords
-        keyword_count, _ = self.count_spam_keywords(text)
-        score += min(keyword_count * 0.5, 3)  # Cap at 3 points
-        
-        # Rule 2: Suspicious URLs
-        url_count = self.check_suspicious_urls(text)
-        score += min(url_count * 0.5, 2)  # Cap at 2 points
-        
-        # Rule 3: Excessive capitals
-        score += self.check_excessive_capitals(text)
-        
-        # Rule 4: Exclamation marks
-        score += self.check_exclamation_marks(text)
-        
-        # Rule 5: Repeated special characters
-        score += self.check_repeated_special_chars(text)
-        
-        # Rule 6: Repeated spam keywords
-        score += self.check_repeated_spam_keywords(text)
-        
-        # Rule 7: Email structure
-        score += self.check_email_structure(text)
-        
-        return round(score, 2)
+        features = self.extract_features(text, self._required_artifacts(), ruleset)
+        return self._score_features(text, features)
+    
+    def _decide(self, text, ruleset, names):
+        """Score text after extracting names; returns the features used too"""
+        features = self.extract_features(text, names, ruleset)
+        spam_score = self._score_features(text, features)
+        if spam_score >= features['ruleset'].threshold:
+            return "SPAM", spam_score, features
+        return "NOT SPAM (HAM)", spam_score, features
+    
+    def quick_classify(self, text, ruleset=None):
+        """
+        Module 5: Decision Module (fast path)
+        Return only (classification, score), without building any analysis
+        """
+        if not text or text.isspace():
+            return "Invalid", 0
+        classification, spam_score, _ = self._decide(text, ruleset, self._required_artifacts())
+        return classification, spam_score
+    
+    def classify_lazy(self, text, ruleset=None):
+        """
+        Module 5: Decision Module
+        Like classify, but each analysis entry is computed on first access,
+        reusing the artifacts already extracted for scoring
+        """
+        return self._classify(text, ruleset, self._required_artifacts())
     
-    def classify(self, text):
+    def classify(self, text, ruleset=None):
         """
         Module 5: Decision Module
         Classify email as Spam or Not Spam based on threshold
+        An explicit ruleset replaces spam_keywords and spam_threshold.
         """
-        if not text or len(text.strip()) == 0:
+        classification, spam_score, analysis = self._classify(
+            text, ruleset, self._scoring_plan()[2])
+        return classification, spam_score, dict(analysis)
+    
+    def _classify(self, text, ruleset, names):
+        """Decide after extracting names, with a lazy analysis of the result"""
+        if not text or text.isspace():
             return "Invalid", 0, {}
-        
-        spam_score = self.calculate_spam_score(text)
-        keyword_count, found_keywords = self.count_spam_keywords(text)
-        url_count = self.check_suspicious_urls(text)
-        
-        # Classification
-        if spam_score >= self.spam_threshold:
-            classification = "SPAM"
-        else:
-            classification = "NOT SPAM (HAM)"
-        
-        # Detailed analysis
-        analysis = {
-            'spam_score': spam_score,
-            'threshold': self.spam_threshold,
-            'keyword_count': keyword_count,
-            'found_keywords': found_keywords[:10],  # Limit to first 10
-            'url_count': url_count,
-            'excessive_capitals': bool(self.check_excessive_capitals(text)),
-            'exclamation_marks': text.count('!'),
-            'repeated_special_chars': bool(self.check_repeated_special_chars(text)),
-            'repeated_keywords': bool(self.check_repeated_spam_keywords(text))
-        }
-        
-        return classification, spam_score, analysis
+        classification, spam_score, features = self._decide(text, ruleset, names)
+        return classification, spam_score, LazyAnalysis(self, text, features, spam_score)
+    
+    def _analysis_value(self, key, text, features):
+        """
+        Compute one entry of the detailed analysis except spam_score,
+        reusing any artifacts the scoring pass already extracted
+        """
+        artifact = ANALYSIS_ARTIFACTS.get(key)
+        if artifact is not None:
+            self._resolve(text, artifact, features)
+        
+        if key == 'threshold':
+            return features['ruleset'].threshold
+        if key == 'keyword_count':
+            return sum(count for _, count in features['keyword_counts'])
+        if key == 'found_keywords':
+            # Limit to first 10
+            return [keyword for keyword, _ in features['keyword_counts'][:10]]
+        if key == 'url_count':
+            return features['url_count']
+        if key == 'url_hosts':
+            return self.url_hosts(features['urls'])
+        if key == 'keyword_counts':
+            # Every keyword found, unlike found_keywords; duplicate entries add up
+            totals = {}
+            for keyword, count in features['keyword_counts']:
+                totals[keyword] = totals.get(keyword, 0) + count
+            return totals
+        if key == 'exclamation_marks':
+            return features['char_stats']['exclamations']
+        if key in ('excessive_capitals', 'repeated_special_chars', 'repeated_keywords'):
+            return features[key]
+        raise KeyError(key)
     
     def analyze_from_file(self, filepath):
         """
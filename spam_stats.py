@@ -0,0 +1,178 @@
+"""
+Corpus Statistics for Bulk Runs
+Streaming aggregates over classify() results in bounded memory
+"""
+
+import time
+
+
+class SpaceSaving:
+    """
+    Space-saving top-k counter (Metwally et al.)
+    Tracks at most `capacity` items; counts are upper bounds and
+    count - error is a lower bound on the true frequency.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, item, count=1):
+        """Count one or more occurrences of item"""
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            # Replace the smallest counter; its count becomes the new error
+            smallest = min(self.counts, key=self.counts.get)
+            min_count = self.counts.pop(smallest)
+            del self.errors[smallest]
+            self.counts[item] = min_count + count
+            self.errors[item] = min_count
+
+    def _floor(self):
+        """Largest count an untracked item could have"""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        """Fold another summary into this one"""
+        own_floor = self._floor()
+        other_floor = other._floor()
+        counts = {}
+        errors = {}
+        for item in set(self.counts) | set(other.counts):
+            counts[item] = (self.counts.get(item, own_floor)
+                            + other.counts.get(item, other_floor))
+            errors[item] = (self.errors.get(item, own_floor)
+                            + other.errors.get(item, other_floor))
+        kept = sorted(counts, key=counts.get, reverse=True)[:self.capacity]
+        self.counts = {item: counts[item] for item in kept}
+        self.errors = {item: errors[item] for item in kept}
+
+    def top(self, n=10):
+        """Most frequent items as (item, count) pairs"""
+        ranked = sorted(self.counts.items(), key=lambda pair: pair[1], reverse=True)
+        return ranked[:n]
+
+
+class CorpusStats:
+    """
+    Aggregate statistics over many classified emails
+    Memory is bounded by the top-k capacity, histogram size and
+    number of time windows kept, whatever the corpus size.
+    """
+
+    def __init__(self, top_k=100, bucket_width=0.5, max_score=15,
+                 window_seconds=3600, max_windows=168):
+        """Initialize empty aggregates"""
+        self.bucket_width = bucket_width
+        self.max_score = max_score
+        self.window_seconds = window_seconds
+        self.max_windows = max_windows
+
+        self.total = 0
+        self.classifications = {}
+        self.keywords = SpaceSaving(top_k)
+        self.hosts = SpaceSaving(top_k)
+
+        # First bucket also collects negative scores, last bucket every
+        # score at or above max_score
+        self.score_buckets = [0] * (int(max_score / bucket_width) + 1)
+
+        # Window start time -> [emails, spam emails]
+        self.windows = {}
+
+    def add(self, result, timestamp=None):
+        """
+        Add one (classification, score, analysis) tuple as returned by
+        SpamDetector.classify
+        """
+        classification, score, analysis = result
+        self.total += 1
+        if classification.startswith("Error"):
+            # Error messages vary per email; keep one counter for all of them
+            classification = "Error"
+        self.classifications[classification] = self.classifications.get(classification, 0) + 1
+        if timestamp is None:
+            timestamp = time.time()
+        start = int(timestamp // self.window_seconds) * self.window_seconds
+        window = self.windows.setdefault(start, [0, 0])
+        window[0] += 1
+        if classification == "SPAM":
+            window[1] += 1
+        self._trim_windows()
+
+        if not analysis:
+            # Invalid input or read error, nothing more to record
+            return
+
+        for keyword, count in analysis.get('keyword_counts', {}).items():
+            self.keywords.add(keyword, count)
+        for host in analysis.get('url_hosts', []):
+            self.hosts.add(host)
+
+        # Negative scores (from custom rules) go in the first bucket
+        bucket = max(0, min(int(score / self.bucket_width), len(self.score_buckets) - 1))
+        self.score_buckets[bucket] += 1
+
+    def _settings(self):
+        """Constructor arguments, which must match for merge()"""
+        return (self.keywords.capacity, self.bucket_width, self.max_score,
+                self.window_seconds, self.max_windows)
+
+    def _trim_windows(self):
+        """Drop the oldest time windows beyond max_windows"""
+        while len(self.windows) > self.max_windows:
+            del self.windows[min(self.windows)]
+
+    def merge(self, other):
+        """
+        Fold in aggregates from another worker
+        Both must be created with the same settings.
+        """
+        if self._settings() != other._settings():
+            raise ValueError("Cannot merge CorpusStats with different settings")
+
+        self.total += other.total
+        for classification, count in other.classifications.items():
+            self.classifications[classification] = self.classifications.get(classification, 0) + count
+        self.keywords.merge(other.keywords)
+        self.hosts.merge(other.hosts)
+        for i, count in enumerate(other.score_buckets):
+            self.score_buckets[i] += count
+        for start, (emails, spam) in other.windows.items():
+            window = self.windows.setdefault(start, [0, 0])
+            window[0] += emails
+            window[1] += spam
+        self._trim_windows()
+        return self
+
+    @property
+    def spam_rate(self):
+        """Fraction of all added emails classified as spam"""
+        if self.total == 0:
+            return 0.0
+        return self.classifications.get("SPAM", 0) / self.total
+
+    def top_keywords(self, n=10):
+        """Most frequently found spam keywords as (keyword, count) pairs"""
+        return self.keywords.top(n)
+
+    def top_hosts(self, n=10):
+        """Most common URL hosts as (host, count) pairs"""
+        return self.hosts.top(n)
+
+    def score_histogram(self):
+        """(lower bound, count) for each score bucket"""
+        return [(round(i * self.bucket_width, 2), count)
+                for i, count in enumerate(self.score_buckets)]
+
+    def spam_rate_over_time(self):
+        """(window start, emails, spam rate) for each kept window, oldest first"""
+        return [(start, emails, spam / emails)
+                for start, (emails, spam) in sorted(self.windows.items())]
@@ -0,0 +1,101 @@
+"""
+Multi-Tenant Rulesets
+Per-customer keyword lists and thresholds served by one detector
+"""
+
+import json
+import os
+import threading
+import weakref
+
+from spam_detector import SpamDetector, Ruleset, normalize_keywords
+
+
+class RulesetRegistry:
+    """
+    Maps tenant names to rulesets and classifies on their behalf
+    Tenants with identical settings share one Ruleset, and all rulesets
+    share compiled keyword matchers, so many tenants fit in one process.
+    """
+
+    def __init__(self, detector=None):
+        """Initialize an empty registry around a shared detector"""
+        self.detector = detector or SpamDetector()
+        self._rulesets = {}
+        # (keywords, threshold) -> Ruleset still used by some tenant
+        self._shared = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def make_ruleset(self, keywords, threshold=3):
+        """
+        Return a Ruleset for these settings, reusing an existing one if possible
+        Raises ValueError unless keywords is a list of strings and threshold
+        a number.
+        """
+        key = (normalize_keywords(keywords), threshold)
+        with self._lock:
+            ruleset = self._shared.get(key)
+            if ruleset is None:
+                ruleset = Ruleset(*key)
+                self._shared[key] = ruleset
+        return ruleset
+
+    def set_ruleset(self, tenant, keywords, threshold=3):
+        """
+        Install or replace a tenant's ruleset
+        Classifications already running keep the ruleset they started with.
+        """
+        ruleset = self.make_ruleset(keywords, threshold)
+        self._rulesets[tenant] = ruleset
+        return ruleset
+
+    def read_file(self, filepath):
+        """
+        Build a Ruleset from a JSON file such as
+        {"keywords": ["free", "winner"], "threshold": 3}
+        without installing it. Invalid files raise ValueError naming the file.
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+                if not isinstance(data, dict) or not isinstance(data.get('keywords'), list):
+                    raise ValueError("'keywords' must be a list of strings")
+                return self.make_ruleset(data['keywords'], data.get('threshold', 3))
+            except ValueError as e:
+                raise ValueError(f"{filepath}: {e}") from e
+
+    def load_file(self, tenant, filepath):
+        """Load and install one tenant's ruleset from a JSON file"""
+        ruleset = self.read_file(filepath)
+        self._rulesets[tenant] = ruleset
+        return ruleset
+
+    def load_directory(self, dirpath):
+        """
+        Load every <tenant>.json file in a directory, returning the tenant names
+        All files are read first; if any is invalid no tenant is changed.
+        """
+        loaded = {}
+        for filename in sorted(os.listdir(dirpath)):
+            tenant, ext = os.path.splitext(filename)
+            if ext == '.json':
+                loaded[tenant] = self.read_file(os.path.join(dirpath, filename))
+        # A single update installs every ruleset at once
+        self._rulesets.update(loaded)
+        return list(loaded)
+
+    def get_ruleset(self, tenant):
+        """Return the tenant's current ruleset; raises KeyError if unknown"""
+        return self._rulesets[tenant]
+
+    def remove(self, tenant):
+        """Forget a tenant"""
+        del self._rulesets[tenant]
+
+    def tenants(self):
+        """Names of all registered tenants"""
+        return list(self._rulesets)
+
+    def classify(self, tenant, text):
+        """Classify text with the tenant's ruleset"""
+        return self.detector.classify(text, self.get_ruleset(tenant))
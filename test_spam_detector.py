@@ -3,7 +3,13 @@ Simple test script for spam detector
 Tests the system with example emails
 """
 
-from spam_detector import SpamDetector
+import json
+import os
+import tempfile
+
+from spam_detector import SpamDetector, Ruleset
+from spam_stats import CorpusStats
+from spam_tenants import RulesetRegistry
 
 
 def test_spam_detector():
@@ -93,6 +99,196 @@ def test_spam_detector():
     print("=" * 70)
 
 
+def test_custom_rules():
+    """Test registering a custom rule and sharing artifacts between rules"""
+    detector = SpamDetector()
+    calls = []
+    
+    def count_tokens(text, features):
+        calls.append('tokens')
+        return features['normalized'].split()
+    
+    detector.register_artifact('counted_tokens', count_tokens, requires=('normalized',))
+    detector.register_rule('long_email', lambda text, f: 1 if len(f['counted_tokens']) > 5 else 0,
+                           requires=('counted_tokens',))
+    detector.register_rule('short_email', lambda text, f: 0.5 if len(f['counted_tokens']) < 3 else 0,
+                           requires=('counted_tokens',))
+    
+    text = "Hello team, the quarterly report is attached for review."
+    base_score = SpamDetector().calculate_spam_score(text)
+    score = detector.calculate_spam_score(text)
+    print(f"Base Score: {base_score}, With Custom Rules: {score}")
+    assert score == base_score + 1
+    assert calls == ['tokens']  # Shared artifact computed once per email
+    
+    # Disabled rules add nothing and their artifacts are not computed
+    detector.get_rule('long_email').enabled = False
+    detector.get_rule('short_email').enabled = False
+    calls.clear()
+    assert detector.calculate_spam_score(text) == base_score
+    assert calls == []
+    
+    # Artifact names are unique, like rule names, and may not shadow the ruleset
+    for name in ('normalized', 'ruleset'):
+        try:
+            detector.register_artifact(name, lambda text, f: text)
+            assert False, f"Artifact name '{name}' was accepted"
+        except ValueError:
+            pass
+    
+    # Duplicate keyword entries each count, as before the rule pipeline
+    detector.spam_keywords.append('free')
+    assert detector.count_spam_keywords("free free free stuff")[0] == 6
+
+
+def test_corpus_stats():
+    """Test streaming aggregates and merging partial results"""
+    detector = SpamDetector()
+    emails = [
+        "FREE MONEY!!! Click here: http://win-cash.tk/now FREE FREE",
+        "Hi team, the meeting moved to 3 PM. Thanks.",
+        "Special offer at www.shop.com, 20% discount on every order",
+    ]
+    
+    full = CorpusStats(top_k=20, window_seconds=60, max_windows=2)
+    workers = [CorpusStats(top_k=20, window_seconds=60, max_windows=2) for _ in range(2)]
+    for i, email in enumerate(emails * 10):
+        result = detector.classify(email)
+        full.add(result, timestamp=i * 10)
+        workers[i % 2].add(result, timestamp=i * 10)
+    
+    merged = workers[0].merge(workers[1])
+    print(f"Spam Rate: {merged.spam_rate:.2f}")
+    print(f"Top Keywords: {merged.top_keywords(3)}")
+    print(f"Top Hosts: {merged.top_hosts(3)}")
+    assert merged.total == full.total == 30
+    assert merged.classifications == full.classifications
+    assert merged.score_buckets == full.score_buckets
+    assert merged.spam_rate_over_time() == full.spam_rate_over_time()
+    assert len(full.windows) == 2  # Older windows dropped
+    assert dict(merged.top_keywords(20))['free'] == 30  # Every occurrence counts
+    
+    # Negative scores land in the lowest bucket; error messages share one key
+    detector.register_rule('trusted_sender', lambda text, f: -2)
+    stats = CorpusStats()
+    stats.add(detector.classify("Hi team, the meeting moved to 3 PM. Thanks."))
+    stats.add(("Error: 'utf-8' codec can't decode byte 0xff in position 7", 0, {}))
+    stats.add(("Error: 'utf-8' codec can't decode byte 0xfe in position 12", 0, {}))
+    assert stats.score_buckets[0] == 1 and sum(stats.score_buckets) == 1
+    assert stats.classifications == {"NOT SPAM (HAM)": 1, "Error": 2}
+    assert stats.spam_rate_over_time()[0][1] == stats.total  # Errors count per window too
+    
+    # Only aggregates with the same settings can be merged
+    try:
+        CorpusStats(top_k=10).merge(CorpusStats(top_k=20))
+        assert False, "Merged CorpusStats with different top_k"
+    except ValueError:
+        pass
+    
+    # Duplicate keyword entries add up, matching keyword_count
+    detector.spam_keywords.append('free')
+    analysis = detector.classify("free free")[2]
+    assert analysis['keyword_counts'] == {'free': 4} and analysis['keyword_count'] == 4
+    assert dict(merged.top_hosts()) == {'win-cash.tk': 10, 'www.shop.com': 10}
+
+
+def test_tenant_rulesets():
+    """Test per-tenant rulesets loaded from files"""
+    registry = RulesetRegistry()
+    with tempfile.TemporaryDirectory() as dirpath:
+        for tenant, threshold in (('acme', 1), ('globex', 1), ('initech', 10)):
+            with open(os.path.join(dirpath, tenant + '.json'), 'w', encoding='utf-8') as f:
+                json.dump({'keywords': ['crypto', 'Wallet'], 'threshold': threshold}, f)
+        assert registry.load_directory(dirpath) == ['acme', 'globex', 'initech']
+    
+    text = "Send your crypto wallet details to get crypto rewards"
+    classification, score, analysis = registry.classify('acme', text)
+    print(f"acme: {classification} ({score}), Keywords: {analysis['found_keywords']}")
+    assert classification == "SPAM"
+    assert analysis['found_keywords'] == ['crypto', 'wallet']
+    assert registry.classify('initech', text)[0] == "NOT SPAM (HAM)"
+    
+    # Identical settings share one ruleset; matchers are shared across all
+    acme = registry.get_ruleset('acme')
+    assert acme is registry.get_ruleset('globex')
+    assert acme.patterns[0] is registry.get_ruleset('initech').patterns[0]
+    
+    # Swapping a ruleset only affects that tenant
+    registry.set_ruleset('acme', ['meeting'], threshold=1)
+    assert registry.classify('acme', text)[0] == "NOT SPAM (HAM)"
+    assert registry.classify('globex', text)[0] == "SPAM"
+    
+    # Keywords are checked and lowercased whichever way the ruleset is built
+    try:
+        registry.set_ruleset('acme', 'crypto')
+        assert False, "A plain string was accepted as a keyword list"
+    except ValueError:
+        pass
+    assert Ruleset(['Wallet']).patterns[0] is registry.get_ruleset('globex').patterns[1]
+    assert Ruleset(k for k in ['free', 'win']).keywords == ('free', 'win')
+    
+    # A bad file in a directory leaves every tenant unchanged
+    with tempfile.TemporaryDirectory() as dirpath:
+        with open(os.path.join(dirpath, 'acme.json'), 'w', encoding='utf-8') as f:
+            json.dump({'keywords': ['invoice']}, f)
+        with open(os.path.join(dirpath, 'globex.json'), 'w', encoding='utf-8') as f:
+            f.write('{"keywords": [')
+        try:
+            registry.load_directory(dirpath)
+            assert False, "Malformed ruleset file was accepted"
+        except ValueError as e:
+            assert 'globex.json' in str(e)
+    assert registry.get_ruleset('acme').keywords == ('meeting',)
+
+
+def test_quick_classify():
+    """Test the score-only fast path and the lazy analysis"""
+    detector = SpamDetector()
+    text = "URGENT!!! Claim your FREE prize at www.win-now.tk before midnight"
+    
+    classification, score, analysis = detector.classify(text)
+    print(f"Quick: {detector.quick_classify(text)}")
+    assert detector.quick_classify(text) == (classification, score)
+    assert detector.quick_classify("   ") == ("Invalid", 0)
+    
+    lazy_classification, lazy_score, lazy = detector.classify_lazy(text)
+    assert (lazy_classification, lazy_score) == (classification, score)
+    assert lazy['found_keywords'] == analysis['found_keywords']
+    assert dict(lazy) == analysis
+    assert lazy.get('missing') is None
+    
+    # Membership does not compute anything
+    _, _, lazy = detector.classify_lazy(text)
+    assert 'found_keywords' in lazy and 'missing' not in lazy
+    assert repr(lazy) == "LazyAnalysis(computed=['spam_score'])"
+    
+    # The checks run by scoring are reused by the analysis, not run again
+    calls = []
+    requires, check = detector.artifacts['repeated_special_chars']
+    
+    def counted_check(text, features):
+        calls.append(text)
+        return check(text, features)
+    
+    detector.artifacts['repeated_special_chars'] = (requires, counted_check)
+    assert detector.classify(text) == (classification, score, analysis)
+    assert len(calls) == 1
+    
+    # A custom rule reusing a built-in rule's name does not change the analysis
+    detector.unregister_rule('excessive_capitals')
+    detector.register_rule('excessive_capitals', lambda text, f: 0.5)
+    assert detector.classify("hello there")[2]['excessive_capitals'] is False
+    
+    # Disabling a rule takes effect on the next call
+    before = detector.quick_classify(text)[1]
+    detector.get_rule('excessive_capitals').enabled = False
+    assert detector.quick_classify(text)[1] == before - 0.5
+
+
 if __name__ == "__main__":
     test_spam_detector()
+    test_custom_rules()
+    test_corpus_stats()
+    test_tenant_rulesets()
+    test_quick_classify()
 